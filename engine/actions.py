@@ -1,8 +1,39 @@
+from dataclasses import dataclass
+from functools import partial
+import heapq
+import itertools
 import time
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
 
-import pyautogui
+from engine.backends import InputBackend
+from engine.backends import create_backend
+from engine.smoothing import OneEuroFilter
 
-from engine.gestures import GestureState
+
+# Restart the cursor filter when the hand has been missing this long.
+_CURSOR_RESET_MS = 250
+
+_DYNAMIC_COOLDOWN_MS = 300
+
+# An action step is either an input call or a pause in milliseconds.
+_Step = Union[Callable[[], None], int]
+
+
+@dataclass(slots=True)
+class _Mapping:
+    """One gesture -> action binding with its arguments already resolved."""
+
+    side: str
+    gesture: str
+    priority: int
+    label: str  # format string, receives conf=
+    channel: Optional[str]  # cooldown group, None for display-only bindings
+    steps: Tuple[_Step, ...]
 
 
 class ActionEngine:
@@ -13,33 +44,142 @@ class ActionEngine:
         click_cooldown: float = 0.45,
         scroll_cooldown: float = 0.20,
         scroll_amount: int = 120,
-        cursor_alpha: float = 0.25,
+        cursor_min_cutoff: float = 0.5,
+        cursor_beta: float = 0.005,
+        cursor_min_interval_ms: int = 8,
+        cursor_deadband_px: int = 2,
+        backend: Optional[InputBackend] = None,
     ):
         self.click_cooldown = click_cooldown
         self.scroll_cooldown = scroll_cooldown
         self.scroll_amount = scroll_amount
-        self.cursor_alpha = cursor_alpha
-        self.gesture_state = GestureState()
+        self.cursor_min_interval_ms = cursor_min_interval_ms
+        self.cursor_deadband_px = cursor_deadband_px
+        self.fx = OneEuroFilter(cursor_min_cutoff, cursor_beta)
+        self.fy = OneEuroFilter(cursor_min_cutoff, cursor_beta)
         self.smooth_x = 0.0
         self.smooth_y = 0.0
-        self.last_dynamic_time = 0.0
+        self._last_cursor_ms = 0
+        self._last_mouse_px = None
+        self._last_move_ms = -cursor_min_interval_ms
+
+        self.backend = backend if backend is not None else create_backend()
+        self.screen_w, self.screen_h = self.backend.size()
+
+        self._cooldowns_ms = {
+            "click": int(click_cooldown * 1000),
+            "scroll": int(scroll_cooldown * 1000),
+            "dynamic": _DYNAMIC_COOLDOWN_MS,
+        }
+        # Start one cooldown in the past so the first trigger always fires.
+        self._last_fired_ms = {channel: -ms for channel, ms in self._cooldowns_ms.items()}
+        self._mapping_index = self._build_mapping_index()
+
+        # Scheduled steps as (due_ms, seq, step); drained by tick().
+        self._pending: List[Tuple[int, int, Callable[[], None]]] = []
+        self._pending_seq = itertools.count()
+
+        # Last formatted action text, reused while mapping and rounded
+        # confidence stay the same.
+        self._last_action_mapping: Optional[_Mapping] = None
+        self._last_action_conf = -1
+        self._last_action_text = ""
+
+    def _default_mappings(self) -> List[_Mapping]:
+        backend = self.backend
+        mappings = [
+            _Mapping("RIGHT", "PINCH", 60, "RIGHT PINCH ({conf:.2f}) -> LEFT CLICK",
+                     "click", (partial(backend.click, "left"),)),
+            _Mapping("LEFT", "PINCH", 50, "LEFT PINCH ({conf:.2f}) -> RIGHT CLICK",
+                     "click", (partial(backend.click, "right"),)),
+            _Mapping("RIGHT", "TWO_UP", 40, "RIGHT TWO UP ({conf:.2f}) -> SCROLL UP",
+                     "scroll", (partial(backend.scroll, self.scroll_amount),)),
+            _Mapping("RIGHT", "TWO_DOWN", 40, "RIGHT TWO DOWN ({conf:.2f}) -> SCROLL DOWN",
+                     "scroll", (partial(backend.scroll, -self.scroll_amount),)),
+            _Mapping("RIGHT", "OPEN_PALM", 30, "OPEN PALM -> NO ACTION", None, ()),
+            _Mapping("LEFT", "OPEN_PALM", 30, "OPEN PALM -> NO ACTION", None, ()),
+        ]
+
+        dynamic_keys = {
+            "SWIPE_LEFT": ("left",),
+            "SWIPE_RIGHT": ("right",),
+            "SWIPE_UP": ("pageup",),
+            "SWIPE_DOWN": ("pagedown",),
+            "PUSH": ("ctrl", "+"),
+            "PULL": ("ctrl", "-"),
+        }
+        for name, keys in dynamic_keys.items():
+            action = partial(backend.press_keys, backend.resolve_keys(keys))
+            mappings.append(
+                _Mapping("RIGHT", name, 20, f"RIGHT {name} ({{conf:.2f}})", "dynamic", (action,))
+            )
 
-        self.screen_w, self.screen_h = pyautogui.size()
+        return mappings
+
+    def _build_mapping_index(self) -> Dict[Tuple[str, str], List[_Mapping]]:
+        index: Dict[Tuple[str, str], List[_Mapping]] = {}
+        for mapping in self._default_mappings():
+            index.setdefault((mapping.side, mapping.gesture), []).append(mapping)
+        for bucket in index.values():
+            bucket.sort(key=lambda m: m.priority, reverse=True)
+        return index
+
+    def _schedule(self, steps: Tuple[_Step, ...], now_ms: int) -> None:
+        due_ms = now_ms
+        for step in steps:
+            if isinstance(step, int):
+                due_ms += step
+            else:
+                heapq.heappush(self._pending, (due_ms, next(self._pending_seq), step))
+
+    def tick(self, now_ms: int) -> None:
+        """Run every scheduled step that is due; never sleeps."""
+        pending = self._pending
+        while pending and pending[0][0] <= now_ms:
+            _, _, step = heapq.heappop(pending)
+            step()
 
     def move_cursor_from_hand(self, hand_state):
-        index_tip = hand_state.landmarks[8]
-        target_x = int(index_tip.x * self.screen_w)
-        target_y = int(index_tip.y * self.screen_h)
+        tip_x, tip_y = hand_state.landmarks[8, :2].tolist()
+        target_x = tip_x * self.screen_w
+        target_y = tip_y * self.screen_h
 
-        if self.smooth_x == 0 and self.smooth_y == 0:
-            self.smooth_x, self.smooth_y = target_x, target_y
+        elapsed_ms = hand_state.timestamp_ms - self._last_cursor_ms
+        if not self.fx.initialized or elapsed_ms > _CURSOR_RESET_MS:
+            self.fx.reset(target_x)
+            self.fy.reset(target_y)
         else:
-            self.smooth_x = self.smooth_x * (1 - self.cursor_alpha) + target_x * self.cursor_alpha
-            self.smooth_y = self.smooth_y * (1 - self.cursor_alpha) + target_y * self.cursor_alpha
+            dt = max(elapsed_ms / 1000.0, 1e-3)
+            self.fx.filter(target_x, dt)
+            self.fy.filter(target_y, dt)
+        self._last_cursor_ms = hand_state.timestamp_ms
+
+        self.smooth_x = min(max(self.fx.value, 0.0), self.screen_w - 1)
+        self.smooth_y = min(max(self.fy.value, 0.0), self.screen_h - 1)
+
+        mouse_px = (int(self.smooth_x), int(self.smooth_y))
+        last_px = self._last_mouse_px
+        # Sub-deadband changes are residual jitter; skip the OS round-trip.
+        if last_px is not None and (
+            abs(mouse_px[0] - last_px[0]) + abs(mouse_px[1] - last_px[1]) < self.cursor_deadband_px
+        ):
+            return
+
+        # Leading-edge throttle: the first move after an idle period is sent
+        # at once, later moves inside the interval are dropped and the next
+        # frame sends the latest filtered position instead.
+        now_ms = hand_state.timestamp_ms
+        if now_ms - self._last_move_ms < self.cursor_min_interval_ms:
+            return
 
-        pyautogui.moveTo(int(self.smooth_x), int(self.smooth_y))
+        self.backend.move_abs(*mouse_px)
+        self._last_mouse_px = mouse_px
+        self._last_move_ms = now_ms
 
-    def apply(self, gestures):
+    def close(self) -> None:
+        self.backend.close()
+
+    def apply(self, gestures, now_ms: Optional[int] = None):
         """
         Default mapping:
         - RIGHT PINCH -> left click
@@ -49,54 +189,38 @@ class ActionEngine:
         - RIGHT SWIPE_LEFT/RIGHT -> left/right arrow
         - RIGHT SWIPE_UP/SWIPE_DOWN -> page up/down
         - RIGHT PUSH/PULL -> Ctrl + '+' / Ctrl + '-'
+
+        `now_ms` should be the frame timestamp on the same monotonic clock
+        used for tracking; it defaults to time.monotonic_ns().
         """
-        now = time.time()
-        action_text = "Tracking"
-
-        right = gestures.get("RIGHT")
-        left = gestures.get("LEFT")
-        right_name = right.name if right else None
-        left_name = left.name if left else None
-
-        if right_name == "PINCH":
-            action_text = f"RIGHT PINCH ({right.confidence:.2f}) -> LEFT CLICK"
-            if now - self.gesture_state.last_click_time >= self.click_cooldown:
-                pyautogui.click(button="left")
-                self.gesture_state.last_click_time = now
-        elif left_name == "PINCH":
-            action_text = f"LEFT PINCH ({left.confidence:.2f}) -> RIGHT CLICK"
-            if now - self.gesture_state.last_click_time >= self.click_cooldown:
-                pyautogui.click(button="right")
-                self.gesture_state.last_click_time = now
-        elif right_name == "TWO_UP":
-            action_text = f"RIGHT TWO UP ({right.confidence:.2f}) -> SCROLL UP"
-            if now - self.gesture_state.last_scroll_time >= self.scroll_cooldown:
-                pyautogui.scroll(self.scroll_amount)
-                self.gesture_state.last_scroll_time = now
-        elif right_name == "TWO_DOWN":
-            action_text = f"RIGHT TWO DOWN ({right.confidence:.2f}) -> SCROLL DOWN"
-            if now - self.gesture_state.last_scroll_time >= self.scroll_cooldown:
-                pyautogui.scroll(-self.scroll_amount)
-                self.gesture_state.last_scroll_time = now
-        elif right_name == "OPEN_PALM" or left_name == "OPEN_PALM":
-            action_text = "OPEN PALM -> NO ACTION"
-        elif right_name in {"SWIPE_LEFT", "SWIPE_RIGHT", "SWIPE_UP", "SWIPE_DOWN", "PUSH", "PULL"}:
-            action_text = f"RIGHT {right_name} ({right.confidence:.2f})"
-            if now - self.last_dynamic_time >= 0.30:
-                if right_name == "SWIPE_LEFT":
-                    pyautogui.press("left")
-                elif right_name == "SWIPE_RIGHT":
-                    pyautogui.press("right")
-                elif right_name == "SWIPE_UP":
-                    pyautogui.press("pageup")
-                elif right_name == "SWIPE_DOWN":
-                    pyautogui.press("pagedown")
-                elif right_name == "PUSH":
-                    pyautogui.hotkey("ctrl", "+")
-                elif right_name == "PULL":
-                    pyautogui.hotkey("ctrl", "-")
-                self.last_dynamic_time = now
-        else:
-            action_text = "Tracking hands"
+        if now_ms is None:
+            now_ms = time.monotonic_ns() // 1_000_000
+
+        best: Optional[_Mapping] = None
+        best_conf = 0.0
+        for side in ("RIGHT", "LEFT"):
+            candidate = gestures.get(side)
+            if not candidate:
+                continue
+            bucket = self._mapping_index.get((side, candidate.name))
+            if bucket and (best is None or bucket[0].priority > best.priority):
+                best = bucket[0]
+                best_conf = candidate.confidence
+
+        if best is None:
+            self.tick(now_ms)
+            return "Tracking hands"
+
+        if best.steps:
+            channel = best.channel
+            if now_ms - self._last_fired_ms[channel] >= self._cooldowns_ms[channel]:
+                self._schedule(best.steps, now_ms)
+                self._last_fired_ms[channel] = now_ms
+        self.tick(now_ms)
 
-        return action_text
+        conf_pct = round(best_conf * 100)
+        if best is not self._last_action_mapping or conf_pct != self._last_action_conf:
+            self._last_action_mapping = best
+            self._last_action_conf = conf_pct
+            self._last_action_text = best.label.format(conf=best_conf)
+        return self._last_action_text
@@ -0,0 +1,502 @@
+"""
+OS input backends used by ActionEngine.
+
+Each backend talks to the platform input API directly (SendInput on
+Windows, Quartz on macOS, XTest on X11) and skips pyautogui's per-call
+work. Key chords are resolved once with `resolve_keys` and replayed with
+`press_keys`. pyautogui remains the fallback for other platforms.
+"""
+
+from abc import ABC
+from abc import abstractmethod
+import ctypes
+import ctypes.util
+import os
+import sys
+from typing import Sequence
+from typing import Tuple
+
+
+# Characters pyautogui types with Shift held (US layout), plus capitals.
+_SHIFTED_CHARS = frozenset('~!@#$%^&*()_+{}|:"<>?')
+
+
+def _with_shift(keys: Sequence[str]) -> Tuple[str, ...]:
+    """Insert "shift" ahead of the first shifted character, as pyautogui does."""
+    out = []
+    for key in keys:
+        if len(key) == 1 and (key in _SHIFTED_CHARS or key.isupper()) and "shift" not in out:
+            out.append("shift")
+        out.append(key)
+    return tuple(out)
+
+
+class FailSafeError(RuntimeError):
+    """Raised when the pointer sits in the top-left corner with failsafe on."""
+
+
+class InputBackend(ABC):
+    """Minimal input surface: absolute moves, clicks, scroll and key chords."""
+
+    def __init__(self, failsafe: bool = True):
+        self.failsafe = failsafe
+
+    @abstractmethod
+    def size(self) -> Tuple[int, int]:
+        ...
+
+    @abstractmethod
+    def position(self) -> Tuple[int, int]:
+        ...
+
+    @abstractmethod
+    def move_abs(self, x: int, y: int) -> None:
+        ...
+
+    @abstractmethod
+    def click(self, button: str = "left") -> None:
+        ...
+
+    @abstractmethod
+    def scroll(self, amount: int) -> None:
+        ...
+
+    @abstractmethod
+    def resolve_keys(self, keys: Sequence[str]):
+        """Translate key names once into whatever `press_keys` replays."""
+
+    @abstractmethod
+    def press_keys(self, resolved) -> None:
+        """Press the chord in order, then release it in reverse order."""
+
+    def close(self) -> None:
+        pass
+
+    def _failsafe_check(self) -> None:
+        if self.failsafe and self.position() == (0, 0):
+            raise FailSafeError("Pointer moved to the top-left corner; input stopped.")
+
+
+class PyAutoGUIBackend(InputBackend):
+    """Portable fallback through pyautogui."""
+
+    def __init__(self, failsafe: bool = True):
+        super().__init__(failsafe)
+        import pyautogui
+
+        self._pg = pyautogui
+        pyautogui.FAILSAFE = failsafe
+        # pyautogui's PAUSE sleeps after every call, including each cursor
+        # move; spacing between action steps is scheduled by ActionEngine.
+        pyautogui.PAUSE = 0
+
+    def size(self) -> Tuple[int, int]:
+        width, height = self._pg.size()
+        return int(width), int(height)
+
+    def position(self) -> Tuple[int, int]:
+        x, y = self._pg.position()
+        return int(x), int(y)
+
+    def move_abs(self, x: int, y: int) -> None:
+        self._pg.moveTo(x, y)
+
+    def click(self, button: str = "left") -> None:
+        self._pg.click(button=button)
+
+    def scroll(self, amount: int) -> None:
+        self._pg.scroll(amount)
+
+    def resolve_keys(self, keys: Sequence[str]):
+        return tuple(keys)
+
+    def press_keys(self, resolved) -> None:
+        if len(resolved) == 1:
+            self._pg.press(resolved[0])
+        else:
+            self._pg.hotkey(*resolved)
+
+
+# --- Windows -----------------------------------------------------------------
+
+_WIN_VK = {
+    "backspace": 0x08, "tab": 0x09, "enter": 0x0D, "shift": 0x10, "ctrl": 0x11,
+    "alt": 0x12, "esc": 0x1B, "space": 0x20, "pageup": 0x21, "pagedown": 0x22,
+    "end": 0x23, "home": 0x24, "left": 0x25, "up": 0x26, "right": 0x27,
+    "down": 0x28, "delete": 0x2E, "win": 0x5B, "+": 0xBB, "=": 0xBB, "-": 0xBD,
+}
+
+
+class Win32Backend(InputBackend):
+    """SendInput with INPUT arrays allocated up front."""
+
+    _INPUT_MOUSE = 0
+    _INPUT_KEYBOARD = 1
+    _KEYEVENTF_KEYUP = 0x0002
+    _MOUSEEVENTF_LEFTDOWN = 0x0002
+    _MOUSEEVENTF_LEFTUP = 0x0004
+    _MOUSEEVENTF_RIGHTDOWN = 0x0008
+    _MOUSEEVENTF_RIGHTUP = 0x0010
+    _MOUSEEVENTF_MIDDLEDOWN = 0x0020
+    _MOUSEEVENTF_MIDDLEUP = 0x0040
+    _MOUSEEVENTF_WHEEL = 0x0800
+
+    def __init__(self, failsafe: bool = True):
+        super().__init__(failsafe)
+        from ctypes import wintypes
+
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_ = [
+                ("dx", wintypes.LONG),
+                ("dy", wintypes.LONG),
+                ("mouseData", wintypes.DWORD),
+                ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t),
+            ]
+
+        class KEYBDINPUT(ctypes.Structure):
+            _fields_ = [
+                ("wVk", wintypes.WORD),
+                ("wScan", wintypes.WORD),
+                ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t),
+            ]
+
+        class HARDWAREINPUT(ctypes.Structure):
+            _fields_ = [
+                ("uMsg", wintypes.DWORD),
+                ("wParamL", wintypes.WORD),
+                ("wParamH", wintypes.WORD),
+            ]
+
+        class _INPUTUNION(ctypes.Union):
+            _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+        class INPUT(ctypes.Structure):
+            _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+        self._INPUT = INPUT
+        self._input_size = ctypes.sizeof(INPUT)
+        self._user32 = ctypes.WinDLL("user32", use_last_error=True)
+        self._user32.SendInput.argtypes = [wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int]
+        self._user32.SendInput.restype = wintypes.UINT
+        self._point = wintypes.POINT()
+
+        # Report physical pixels, as pyautogui does.
+        try:
+            self._user32.SetProcessDPIAware()
+        except AttributeError:
+            pass
+
+        self._click_buf = (INPUT * 2)()
+        self._wheel_buf = (INPUT * 1)()
+        for item in self._click_buf:
+            item.type = self._INPUT_MOUSE
+        self._wheel_buf[0].type = self._INPUT_MOUSE
+        self._wheel_buf[0].u.mi.dwFlags = self._MOUSEEVENTF_WHEEL
+
+        self._click_flags = {
+            "left": (self._MOUSEEVENTF_LEFTDOWN, self._MOUSEEVENTF_LEFTUP),
+            "right": (self._MOUSEEVENTF_RIGHTDOWN, self._MOUSEEVENTF_RIGHTUP),
+            "middle": (self._MOUSEEVENTF_MIDDLEDOWN, self._MOUSEEVENTF_MIDDLEUP),
+        }
+
+    def size(self) -> Tuple[int, int]:
+        return self._user32.GetSystemMetrics(0), self._user32.GetSystemMetrics(1)
+
+    def position(self) -> Tuple[int, int]:
+        self._user32.GetCursorPos(ctypes.byref(self._point))
+        return self._point.x, self._point.y
+
+    def move_abs(self, x: int, y: int) -> None:
+        self._failsafe_check()
+        self._user32.SetCursorPos(x, y)
+
+    def click(self, button: str = "left") -> None:
+        self._failsafe_check()
+        down, up = self._click_flags[button]
+        self._click_buf[0].u.mi.dwFlags = down
+        self._click_buf[1].u.mi.dwFlags = up
+        self._user32.SendInput(2, self._click_buf, self._input_size)
+
+    def scroll(self, amount: int) -> None:
+        self._failsafe_check()
+        # Same units as pyautogui on Windows: raw wheel delta, 120 per notch.
+        self._wheel_buf[0].u.mi.mouseData = amount & 0xFFFFFFFF
+        self._user32.SendInput(1, self._wheel_buf, self._input_size)
+
+    def resolve_keys(self, keys: Sequence[str]):
+        keys = _with_shift(keys)
+        codes = [_WIN_VK[k] if k in _WIN_VK else ord(k.upper()) for k in keys]
+        events = list(codes) + list(reversed(codes))
+        buf = (self._INPUT * len(events))()
+        for i, code in enumerate(events):
+            buf[i].type = self._INPUT_KEYBOARD
+            buf[i].u.ki.wVk = code
+            buf[i].u.ki.dwFlags = 0 if i < len(codes) else self._KEYEVENTF_KEYUP
+        return len(events), buf
+
+    def press_keys(self, resolved) -> None:
+        self._failsafe_check()
+        count, buf = resolved
+        self._user32.SendInput(count, buf, self._input_size)
+
+
+# --- macOS -------------------------------------------------------------------
+
+_MAC_KEYCODES = {
+    "a": 0, "s": 1, "d": 2, "f": 3, "h": 4, "g": 5, "z": 6, "x": 7, "c": 8,
+    "v": 9, "b": 11, "q": 12, "w": 13, "e": 14, "r": 15, "y": 16, "t": 17,
+    "1": 18, "2": 19, "3": 20, "4": 21, "6": 22, "5": 23, "=": 24, "+": 24,
+    "9": 25, "7": 26, "-": 27, "8": 28, "0": 29, "o": 31, "u": 32, "i": 34,
+    "p": 35, "enter": 36, "l": 37, "j": 38, "k": 40, "n": 45, "m": 46,
+    "tab": 48, "space": 49, "backspace": 51, "esc": 53, "command": 55,
+    "shift": 56, "alt": 58, "ctrl": 59, "home": 115, "pageup": 116,
+    "delete": 117, "end": 119, "pagedown": 121, "left": 123, "right": 124,
+    "down": 125, "up": 126,
+}
+
+
+class QuartzBackend(InputBackend):
+    """CGEventPost through pyobjc's Quartz bindings."""
+
+    def __init__(self, failsafe: bool = True):
+        super().__init__(failsafe)
+        import Quartz
+
+        self._q = Quartz
+        self._buttons = {
+            "left": (Quartz.kCGEventLeftMouseDown, Quartz.kCGEventLeftMouseUp,
+                     Quartz.kCGMouseButtonLeft),
+            "right": (Quartz.kCGEventRightMouseDown, Quartz.kCGEventRightMouseUp,
+                      Quartz.kCGMouseButtonRight),
+            "middle": (Quartz.kCGEventOtherMouseDown, Quartz.kCGEventOtherMouseUp,
+                       Quartz.kCGMouseButtonCenter),
+        }
+        self._modifier_flags = {
+            "ctrl": Quartz.kCGEventFlagMaskControl,
+            "shift": Quartz.kCGEventFlagMaskShift,
+            "alt": Quartz.kCGEventFlagMaskAlternate,
+            "command": Quartz.kCGEventFlagMaskCommand,
+        }
+
+    def size(self) -> Tuple[int, int]:
+        display = self._q.CGMainDisplayID()
+        return self._q.CGDisplayPixelsWide(display), self._q.CGDisplayPixelsHigh(display)
+
+    def position(self) -> Tuple[int, int]:
+        location = self._q.CGEventGetLocation(self._q.CGEventCreate(None))
+        return int(location.x), int(location.y)
+
+    def _post_mouse(self, kind, x: int, y: int, button) -> None:
+        event = self._q.CGEventCreateMouseEvent(None, kind, (x, y), button)
+        self._q.CGEventPost(self._q.kCGHIDEventTap, event)
+
+    def move_abs(self, x: int, y: int) -> None:
+        self._failsafe_check()
+        self._post_mouse(self._q.kCGEventMouseMoved, x, y, self._q.kCGMouseButtonLeft)
+
+    def click(self, button: str = "left") -> None:
+        self._failsafe_check()
+        down, up, code = self._buttons[button]
+        x, y = self.position()
+        self._post_mouse(down, x, y, code)
+        self._post_mouse(up, x, y, code)
+
+    def scroll(self, amount: int) -> None:
+        self._failsafe_check()
+        # Same units as pyautogui on macOS: lines, posted in chunks of 10.
+        step = 10 if amount > 0 else -10
+        remaining = amount
+        while remaining:
+            chunk = step if abs(remaining) > 10 else remaining
+            event = self._q.CGEventCreateScrollWheelEvent(
+                None, self._q.kCGScrollEventUnitLine, 1, chunk
+            )
+            self._q.CGEventPost(self._q.kCGHIDEventTap, event)
+            remaining -= chunk
+
+    def resolve_keys(self, keys: Sequence[str]):
+        keys = _with_shift(keys)
+        codes = [_MAC_KEYCODES[k.lower()] for k in keys]
+        # Flags active while each key is down, so chords reach apps as
+        # modified keys even though events are posted one by one.
+        flags = []
+        held = 0
+        for key in keys:
+            held |= self._modifier_flags.get(key, 0)
+            flags.append(held)
+        return tuple(zip(codes, flags))
+
+    def press_keys(self, resolved) -> None:
+        self._failsafe_check()
+        q = self._q
+        for code, flags in resolved:
+            event = q.CGEventCreateKeyboardEvent(None, code, True)
+            q.CGEventSetFlags(event, flags)
+            q.CGEventPost(q.kCGHIDEventTap, event)
+        for code, flags in reversed(resolved):
+            event = q.CGEventCreateKeyboardEvent(None, code, False)
+            q.CGEventSetFlags(event, flags)
+            q.CGEventPost(q.kCGHIDEventTap, event)
+
+
+# --- X11 ---------------------------------------------------------------------
+
+_X11_KEYSYMS = {
+    "backspace": 0xFF08, "tab": 0xFF09, "enter": 0xFF0D, "esc": 0xFF1B,
+    "home": 0xFF50, "left": 0xFF51, "up": 0xFF52, "right": 0xFF53,
+    "down": 0xFF54, "pageup": 0xFF55, "pagedown": 0xFF56, "end": 0xFF57,
+    "shift": 0xFFE1, "ctrl": 0xFFE3, "alt": 0xFFE9, "win": 0xFFEB,
+    "delete": 0xFFFF, "space": 0x20, "+": 0x2B, "-": 0x2D, "=": 0x3D,
+}
+
+
+class X11Backend(InputBackend):
+    """XTest fake events through libX11/libXtst loaded with ctypes."""
+
+    _BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+    def __init__(self, failsafe: bool = True):
+        super().__init__(failsafe)
+        x11_path = ctypes.util.find_library("X11")
+        xtst_path = ctypes.util.find_library("Xtst")
+        if not x11_path or not xtst_path:
+            raise OSError("libX11/libXtst not found")
+
+        xlib = ctypes.CDLL(x11_path)
+        xtst = ctypes.CDLL(xtst_path)
+        c_ulong_p = ctypes.POINTER(ctypes.c_ulong)
+        c_int_p = ctypes.POINTER(ctypes.c_int)
+        c_uint_p = ctypes.POINTER(ctypes.c_uint)
+
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        xlib.XDisplayWidth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XKeysymToKeycode.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+        xlib.XKeysymToKeycode.restype = ctypes.c_ubyte
+        xlib.XQueryPointer.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, c_ulong_p, c_ulong_p,
+            c_int_p, c_int_p, c_int_p, c_int_p, c_uint_p,
+        ]
+        xlib.XFlush.argtypes = [ctypes.c_void_p]
+        xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        xtst.XTestFakeMotionEvent.argtypes = [
+            ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_ulong,
+        ]
+        xtst.XTestFakeButtonEvent.argtypes = [
+            ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong,
+        ]
+        xtst.XTestFakeKeyEvent.argtypes = [
+            ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong,
+        ]
+
+        display = xlib.XOpenDisplay(None)
+        if not display:
+            raise OSError("Could not open X display")
+
+        self._xlib = xlib
+        self._xtst = xtst
+        self._display = display
+        self._screen = xlib.XDefaultScreen(display)
+        self._root = xlib.XDefaultRootWindow(display)
+
+        # Out-parameters for XQueryPointer, reused across calls.
+        self._qp_window = ctypes.c_ulong()
+        self._qp_child = ctypes.c_ulong()
+        self._qp_root_x = ctypes.c_int()
+        self._qp_root_y = ctypes.c_int()
+        self._qp_win_x = ctypes.c_int()
+        self._qp_win_y = ctypes.c_int()
+        self._qp_mask = ctypes.c_uint()
+
+    def size(self) -> Tuple[int, int]:
+        return (
+            self._xlib.XDisplayWidth(self._display, self._screen),
+            self._xlib.XDisplayHeight(self._display, self._screen),
+        )
+
+    def position(self) -> Tuple[int, int]:
+        self._xlib.XQueryPointer(
+            self._display,
+            self._root,
+            ctypes.byref(self._qp_window),
+            ctypes.byref(self._qp_child),
+            ctypes.byref(self._qp_root_x),
+            ctypes.byref(self._qp_root_y),
+            ctypes.byref(self._qp_win_x),
+            ctypes.byref(self._qp_win_y),
+            ctypes.byref(self._qp_mask),
+        )
+        return self._qp_root_x.value, self._qp_root_y.value
+
+    def move_abs(self, x: int, y: int) -> None:
+        self._failsafe_check()
+        self._xtst.XTestFakeMotionEvent(self._display, -1, x, y, 0)
+        self._xlib.XFlush(self._display)
+
+    def _button(self, button: int, repeat: int = 1) -> None:
+        fake = self._xtst.XTestFakeButtonEvent
+        for _ in range(repeat):
+            fake(self._display, button, True, 0)
+            fake(self._display, button, False, 0)
+        self._xlib.XFlush(self._display)
+
+    def click(self, button: str = "left") -> None:
+        self._failsafe_check()
+        self._button(self._BUTTONS[button])
+
+    def scroll(self, amount: int) -> None:
+        self._failsafe_check()
+        # Same units as pyautogui on X11: one wheel button click per unit.
+        self._button(4 if amount > 0 else 5, repeat=abs(amount))
+
+    def resolve_keys(self, keys: Sequence[str]):
+        codes = []
+        for key in _with_shift(keys):
+            keysym = _X11_KEYSYMS.get(key, ord(key.lower()) if len(key) == 1 else 0)
+            code = self._xlib.XKeysymToKeycode(self._display, keysym)
+            if not code:
+                raise ValueError(f"No keycode for key {key!r}")
+            codes.append(code)
+        return tuple(codes)
+
+    def press_keys(self, resolved) -> None:
+        self._failsafe_check()
+        fake = self._xtst.XTestFakeKeyEvent
+        for code in resolved:
+            fake(self._display, code, True, 0)
+        for code in reversed(resolved):
+            fake(self._display, code, False, 0)
+        self._xlib.XFlush(self._display)
+
+    def close(self) -> None:
+        if self._display:
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+
+
+def create_backend(failsafe: bool = True) -> InputBackend:
+    """Pick the native backend for this platform, else fall back to pyautogui."""
+    if sys.platform == "win32":
+        return Win32Backend(failsafe)
+
+    if sys.platform == "darwin":
+        try:
+            return QuartzBackend(failsafe)
+        except ImportError:
+            pass
+
+    if sys.platform.startswith("linux") and os.environ.get("DISPLAY"):
+        try:
+            return X11Backend(failsafe)
+        except OSError:
+            pass
+
+    return PyAutoGUIBackend(failsafe)
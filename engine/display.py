@@ -0,0 +1,90 @@
+import queue
+import sys
+import threading
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class FrameDisplay:
+    """
+    Show preview frames without blocking the tracking loop.
+
+    Frames go through a one-slot queue to a display thread that owns the
+    window and the 'q' key check; a frame not yet shown is replaced by the
+    newer one. macOS HighGUI must run on the main thread, so there the
+    frames are shown inline instead.
+    """
+
+    def __init__(self, window_name: str, threaded: Optional[bool] = None):
+        if threaded is None:
+            threaded = sys.platform != "darwin"
+
+        self.window_name = window_name
+        self.stop_requested = threading.Event()
+        self._queue: queue.Queue = queue.Queue(maxsize=1)
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        if threaded:
+            self._thread = threading.Thread(target=self._run, name="display", daemon=True)
+            self._thread.start()
+
+    def show(self, frame: np.ndarray) -> None:
+        """Queue `frame` for display; the caller must not modify it afterwards."""
+        if self._thread is None:
+            cv2.imshow(self.window_name, frame)
+            return
+
+        try:
+            self._queue.put_nowait(frame)
+        except queue.Full:
+            # Drop the stale frame; this is the only producer, so the slot
+            # is free again once it is taken.
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._queue.put_nowait(frame)
+
+    def poll(self) -> bool:
+        """
+        Return False once the user has quit. Inline mode pumps window
+        events here; a display thread failure is re-raised here so it stops
+        the main loop.
+        """
+        if self._thread is None:
+            self._check_quit()
+        # _run records the error before setting stop_requested, so reading
+        # the flag first cannot miss a failure.
+        running = not self.stop_requested.is_set()
+        if self._error is not None:
+            raise RuntimeError("Display thread failed") from self._error
+        return running
+
+    def close(self) -> None:
+        self.stop_requested.set()
+        if self._thread is not None:
+            self._thread.join()
+        else:
+            cv2.destroyAllWindows()
+
+    def _check_quit(self) -> None:
+        if cv2.waitKey(1) & 0xFF == ord("q"):
+            self.stop_requested.set()
+
+    def _run(self) -> None:
+        try:
+            while not self.stop_requested.is_set():
+                try:
+                    frame = self._queue.get(timeout=0.02)
+                except queue.Empty:
+                    frame = None
+                if frame is not None:
+                    cv2.imshow(self.window_name, frame)
+                self._check_quit()
+            cv2.destroyAllWindows()
+        except BaseException as exc:
+            self._error = exc
+        finally:
+            self.stop_requested.set()
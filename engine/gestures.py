@@ -1,59 +1,122 @@
-from collections import deque
 from dataclasses import dataclass
-from typing import Deque
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 
+import numpy as np
 
-@dataclass
-class GestureState:
-    """Track timing for gesture debouncing."""
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernel then runs as plain NumPy.
+    njit = None
 
-    last_click_time: float = 0.0
-    last_scroll_time: float = 0.0
 
-
-@dataclass
+@dataclass(slots=True)
 class GestureCandidate:
     name: str
     confidence: float
     source: str  # STATIC or DYNAMIC
 
 
-def _distance(p1, p2):
-    return ((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2) ** 0.5
+# Static gesture codes produced by the landmark kernel.
+_GESTURE_NONE = 0
+_GESTURE_PINCH = 1
+_GESTURE_OPEN_PALM = 2
+_GESTURE_TWO_UP = 3
+_GESTURE_TWO_DOWN = 4
+
+_GESTURE_NAMES = (None, "PINCH", "OPEN_PALM", "TWO_UP", "TWO_DOWN")
+
+# Index, middle, ring, pinky.
+_FINGER_TIPS = np.array([8, 12, 16, 20])
+_FINGER_PIPS = np.array([6, 10, 14, 18])
+
+_PINCH_DISTANCE_SQ = 0.05 * 0.05
+
+
+def _jit(fn):
+    return njit(cache=True, nogil=True)(fn) if njit is not None else fn
+
+
+@_jit
+def _classify_static(lm: np.ndarray) -> int:
+    """Classify a (21, 3) landmark array into a static gesture code."""
+    # Pinch only needs thumb/index tips, so it is tested before anything else.
+    dx = lm[4, 0] - lm[8, 0]
+    dy = lm[4, 1] - lm[8, 1]
+    if dx * dx + dy * dy < _PINCH_DISTANCE_SQ:
+        return _GESTURE_PINCH
+
+    # Bit i is set when finger i (index, middle, ring, pinky) is extended.
+    ups = lm[_FINGER_TIPS, 1] < lm[_FINGER_PIPS, 1]
+    mask = int(ups[0]) | (int(ups[1]) << 1) | (int(ups[2]) << 2) | (int(ups[3]) << 3)
+
+    if mask == 0b1111:
+        return _GESTURE_OPEN_PALM
 
+    two = mask & 0b0011
+    if two == 0b0011:
+        return _GESTURE_TWO_UP
 
-def _is_finger_up(landmarks, tip_id, pip_id):
-    return landmarks[tip_id].y < landmarks[pip_id].y
+    wrist_y = lm[0, 1]
+    if two == 0 and lm[8, 1] > wrist_y and lm[12, 1] > wrist_y:
+        return _GESTURE_TWO_DOWN
 
+    return _GESTURE_NONE
 
-def detect_simple_gesture(lm):
+
+def detect_simple_gesture(lm: np.ndarray) -> Optional[str]:
     """Return one of: PINCH, TWO_UP, TWO_DOWN, OPEN_PALM, or None."""
-    thumb_tip = (lm[4].x, lm[4].y)
-    index_tip = (lm[8].x, lm[8].y)
+    return _GESTURE_NAMES[_classify_static(lm)]
+
+
+# Window positions are stored as Q1.14 fixed point (1.0 -> 16384).
+_POS_SCALE = 1 << 14
+
+
+class _SideHistory:
+    """
+    Fixed-size ring buffer of one hand's motion window.
+
+    Only the fields dynamic detection reads are kept (anchor position,
+    speed, timestamp), not the full HandState objects. Slots are plain
+    Python lists: per-element NumPy stores cost more than the whole
+    append for a window this small.
+    """
 
-    index_up = _is_finger_up(lm, tip_id=8, pip_id=6)
-    middle_up = _is_finger_up(lm, tip_id=12, pip_id=10)
+    def __init__(self, size: int):
+        self.size = size
+        self.pos_q: List[Tuple[int, int, int]] = [(0, 0, 0)] * size
+        self.speed: List[float] = [0.0] * size
+        self.ts: List[int] = [0] * size
+        self.head = 0  # next slot to write
+        self.count = 0
+        self.speed_sum = 0.0
 
-    if _distance(thumb_tip, index_tip) < 0.05:
-        return "PINCH"
+    def append(self, hand) -> None:
+        i = self.head
+        evicted = self.speed[i] if self.count == self.size else 0.0
 
-    ring_up = _is_finger_up(lm, tip_id=16, pip_id=14)
-    pinky_up = _is_finger_up(lm, tip_id=20, pip_id=18)
-    if index_up and middle_up and ring_up and pinky_up:
-        return "OPEN_PALM"
+        position = hand.position
+        self.pos_q[i] = (
+            round(position.x * _POS_SCALE),
+            round(position.y * _POS_SCALE),
+            round(position.z * _POS_SCALE),
+        )
+        self.speed[i] = hand.speed
+        self.ts[i] = hand.timestamp_ms
+        self.speed_sum += hand.speed - evicted
 
-    if index_up and middle_up:
-        return "TWO_UP"
+        self.head = (i + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
 
-    wrist_y = lm[0].y
-    if (not index_up) and (not middle_up):
-        if lm[8].y > wrist_y and lm[12].y > wrist_y:
-            return "TWO_DOWN"
+    def first_index(self) -> int:
+        return (self.head - self.count) % self.size
 
-    return None
+    def last_index(self) -> int:
+        return (self.head - 1) % self.size
 
 
 def _candidate(name: str, confidence: float, source: str) -> GestureCandidate:
@@ -69,7 +132,7 @@ class GestureRecognizer:
 
     def __init__(self, history_size: int = 18):
         self.history_size = history_size
-        self.history: Dict[str, Deque] = {}
+        self.history: Dict[str, _SideHistory] = {}
 
         # Dynamic thresholds in normalized camera units.
         self.swipe_dx_threshold = 0.12
@@ -77,11 +140,15 @@ class GestureRecognizer:
         self.push_pull_dz_threshold = 0.045
         self.min_avg_speed = 0.8
 
+        # Compile the static kernel now rather than on the first detected hand.
+        _classify_static(np.zeros((21, 3), dtype=np.float32))
+
     def _update_history(self, frame_state):
         for hand in frame_state.hands:
-            if hand.side not in self.history:
-                self.history[hand.side] = deque(maxlen=self.history_size)
-            self.history[hand.side].append(hand)
+            hist = self.history.get(hand.side)
+            if hist is None:
+                hist = self.history[hand.side] = _SideHistory(self.history_size)
+            hist.append(hand)
 
     def _detect_static_for_hand(self, hand) -> Optional[GestureCandidate]:
         name = detect_simple_gesture(hand.landmarks)
@@ -92,38 +159,41 @@ class GestureRecognizer:
         return _candidate(name=name, confidence=0.82, source="STATIC")
 
     def _detect_dynamic_for_hand(self, side: str) -> Optional[GestureCandidate]:
-        points: List = list(self.history.get(side, []))
-        if len(points) < 6:
+        hist = self.history.get(side)
+        if hist is None or hist.count < 6:
             return None
 
-        first = points[0]
-        last = points[-1]
+        first = hist.first_index()
+        last = hist.last_index()
 
-        dx = last.position.x - first.position.x
-        dy = last.position.y - first.position.y
-        dz = last.position.z - first.position.z
+        last_x, last_y, last_z = hist.pos_q[last]
+        first_x, first_y, first_z = hist.pos_q[first]
+        dx = last_x - first_x
+        dy = last_y - first_y
+        dz = last_z - first_z
 
-        avg_speed = sum(p.speed for p in points) / len(points)
-        duration_s = max((last.timestamp_ms - first.timestamp_ms) / 1000.0, 1e-3)
+        avg_speed = hist.speed_sum / hist.count
+        duration_ms = hist.ts[last] - hist.ts[first]
 
         # Require enough temporal energy so small jitter is ignored.
-        if avg_speed < self.min_avg_speed and duration_s < 0.12:
+        if avg_speed < self.min_avg_speed and duration_ms < 120:
             return None
 
         abs_dx = abs(dx)
         abs_dy = abs(dy)
         abs_dz = abs(dz)
 
-        if abs_dx > self.swipe_dx_threshold and abs_dx > abs_dy:
-            conf = min(1.0, abs_dx / self.swipe_dx_threshold) * 0.7 + min(0.3, avg_speed / 3.0)
+        # Each branch only fires past its threshold, where the displacement
+        # term min(1, abs_d / threshold) is saturated at 1.0.
+        conf = 0.7 + min(0.3, avg_speed / 3.0)
+
+        if abs_dx > self.swipe_dx_threshold * _POS_SCALE and abs_dx > abs_dy:
             return _candidate("SWIPE_RIGHT" if dx > 0 else "SWIPE_LEFT", conf, "DYNAMIC")
 
-        if abs_dy > self.swipe_dy_threshold and abs_dy > abs_dx:
-            conf = min(1.0, abs_dy / self.swipe_dy_threshold) * 0.7 + min(0.3, avg_speed / 3.0)
+        if abs_dy > self.swipe_dy_threshold * _POS_SCALE and abs_dy > abs_dx:
             return _candidate("SWIPE_DOWN" if dy > 0 else "SWIPE_UP", conf, "DYNAMIC")
 
-        if abs_dz > self.push_pull_dz_threshold:
-            conf = min(1.0, abs_dz / self.push_pull_dz_threshold) * 0.7 + min(0.3, avg_speed / 3.0)
+        if abs_dz > self.push_pull_dz_threshold * _POS_SCALE:
             # MediaPipe z gets more negative when hand moves closer.
             return _candidate("PUSH" if dz > 0 else "PULL", conf, "DYNAMIC")
 
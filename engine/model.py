@@ -1,5 +1,11 @@
+import hashlib
+import os
 from pathlib import Path
+import shutil
+from typing import Optional
+import urllib.error
 import urllib.request
+import zipfile
 
 
 DEFAULT_MODEL_URL = (
@@ -7,14 +13,102 @@ DEFAULT_MODEL_URL = (
     "hand_landmarker/float16/1/hand_landmarker.task"
 )
 
+# Set to the published digest to reject corrupted or substituted downloads.
+# Without it only the bundle's own zip CRCs are checked, and interrupted
+# downloads restart instead of resuming.
+DEFAULT_MODEL_SHA256: Optional[str] = None
 
-def ensure_hand_model(model_path: Path) -> None:
+_CHUNK_SIZE = 1 << 20
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _bundle_error(path: Path) -> Optional[str]:
+    """Return why `path` is not an intact .task (zip) bundle, or None."""
+    try:
+        with zipfile.ZipFile(path) as bundle:
+            bad_member = bundle.testzip()
+    except zipfile.BadZipFile as exc:
+        return str(exc)
+    if bad_member is not None:
+        return f"corrupt member {bad_member}"
+    return None
+
+
+def _verify(path: Path, digest: str, sha256: Optional[str]) -> Optional[str]:
+    """Return why the downloaded file at `path` is unusable, or None."""
+    if sha256 and digest != sha256.lower():
+        return f"checksum mismatch: expected {sha256}, got {digest}"
+    return _bundle_error(path)
+
+
+def _download(url: str, part_path: Path) -> None:
+    """Stream `url` into `part_path`, resuming from bytes already on disk."""
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    request = urllib.request.Request(url)
+    if offset:
+        request.add_header("Range", f"bytes={offset}-")
+
+    try:
+        response = urllib.request.urlopen(request)
+    except urllib.error.HTTPError as exc:
+        if exc.code != 416 or not offset:
+            raise
+        # Range not satisfiable: the partial file is unusable, start over.
+        part_path.unlink()
+        _download(url, part_path)
+        return
+
+    with response:
+        if offset and response.status != 206:
+            # Server ignored the range request and sent the whole file.
+            offset = 0
+        expected = response.headers.get("Content-Length")
+        with part_path.open("ab" if offset else "wb") as f:
+            shutil.copyfileobj(response, f, length=_CHUNK_SIZE)
+
+    written = part_path.stat().st_size - offset
+    if expected is not None and written != int(expected):
+        raise OSError(f"Incomplete download from {url}: got {written} of {expected} bytes")
+
+
+def ensure_hand_model(
+    model_path: Path,
+    url: str = DEFAULT_MODEL_URL,
+    sha256: Optional[str] = DEFAULT_MODEL_SHA256,
+) -> None:
     """Ensure the MediaPipe hand model exists locally."""
     if model_path.exists():
         return
 
     model_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = model_path.with_name(model_path.name + ".part")
+    if not sha256 and part_path.exists():
+        # Without a digest a stale prefix would go unnoticed; start over.
+        part_path.unlink()
+
     print(f"Downloading model to {model_path} ...")
-    urllib.request.urlretrieve(DEFAULT_MODEL_URL, str(model_path))
-    print("Model downloaded.")
+    _download(url, part_path)
+
+    digest = _sha256(part_path)
+    problem = _verify(part_path, digest, sha256)
+    if problem is not None:
+        # A resumed part file may have been stale; retry once from scratch.
+        print(f"Downloaded model is invalid ({problem}), downloading again ...")
+        part_path.unlink()
+        _download(url, part_path)
+        digest = _sha256(part_path)
+        problem = _verify(part_path, digest, sha256)
+        if problem is not None:
+            part_path.unlink()
+            raise OSError(f"Invalid model from {url}: {problem}")
 
+    # Only a complete, verified file ever appears at model_path.
+    os.replace(part_path, model_path)
+    print(f"Model downloaded (sha256 {digest}).")
@@ -1,6 +1,8 @@
-import math
 from dataclasses import dataclass
-from typing import Dict, List
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
 
 from engine.types import FrameState
 from engine.types import HandObservation
@@ -8,38 +10,18 @@ from engine.types import HandState
 from engine.types import Vec3
 
 
-@dataclass
-class _History:
-    position: Vec3
-    velocity: Vec3
-    acceleration: Vec3
-    timestamp_ms: int
-
-
-def _lerp(a: float, b: float, alpha: float) -> float:
-    return (a * (1.0 - alpha)) + (b * alpha)
-
-
-def _vec_lerp(a: Vec3, b: Vec3, alpha: float) -> Vec3:
-    return Vec3(
-        x=_lerp(a.x, b.x, alpha),
-        y=_lerp(a.y, b.y, alpha),
-        z=_lerp(a.z, b.z, alpha),
-    )
-
+_Triple = Tuple[float, float, float]
 
-def _vec_sub(a: Vec3, b: Vec3) -> Vec3:
-    return Vec3(a.x - b.x, a.y - b.y, a.z - b.z)
 
-
-def _vec_div(v: Vec3, scalar: float) -> Vec3:
-    if scalar == 0:
-        return Vec3(0.0, 0.0, 0.0)
-    return Vec3(v.x / scalar, v.y / scalar, v.z / scalar)
+@dataclass(frozen=True, slots=True)
+class _History:
+    position: _Triple
+    velocity: _Triple
+    acceleration: _Triple
+    timestamp_ms: int
 
 
-def _vec_mag(v: Vec3) -> float:
-    return math.sqrt(v.x * v.x + v.y * v.y + v.z * v.z)
+_ZERO3: _Triple = (0.0, 0.0, 0.0)
 
 
 class MotionEstimator:
@@ -50,15 +32,17 @@ class MotionEstimator:
         self.max_stale_ms = max_stale_ms
         self._history: Dict[str, _History] = {}
 
-    def _position_from_landmarks(self, landmarks) -> Vec3:
+    def _position_from_landmarks(self, landmarks: np.ndarray) -> _Triple:
         # Index fingertip is used as control anchor for now.
-        tip = landmarks[8]
-        return Vec3(float(tip.x), float(tip.y), float(tip.z))
+        x, y, z = landmarks[8].tolist()
+        return x, y, z
 
     def update(
         self, observations: List[HandObservation], timestamp_ms: int
     ) -> FrameState:
         hands: List[HandState] = []
+        right = None
+        left = None
         now = int(timestamp_ms)
 
         # Remove stale history entries.
@@ -72,26 +56,41 @@ class MotionEstimator:
 
         for obs in observations:
             side = obs.side if obs.side in {"LEFT", "RIGHT"} else f"HAND_{len(hands)}"
-            current = self._position_from_landmarks(obs.landmarks)
+            cx, cy, cz = self._position_from_landmarks(obs.landmarks)
 
+            # Three-element vectors are cheaper as Python floats than as
+            # NumPy arrays, where every operation allocates.
             if side not in self._history:
-                pos = current
-                vel = Vec3(0.0, 0.0, 0.0)
-                acc = Vec3(0.0, 0.0, 0.0)
+                pos = (cx, cy, cz)
+                vel = _ZERO3
+                acc = _ZERO3
             else:
                 prev = self._history[side]
                 dt = max((now - prev.timestamp_ms) / 1000.0, 1e-3)
+                alpha = self.smoothing_alpha
+                keep = 1.0 - alpha
+                k = alpha / dt
+
+                px, py, pz = prev.position
+                vx, vy, vz = prev.velocity
+                ax, ay, az = prev.acceleration
+
+                # EMA toward the landmark, then toward the raw derivatives.
+                pos = (px * keep + cx * alpha, py * keep + cy * alpha, pz * keep + cz * alpha)
+                vel = (
+                    vx * keep + k * (pos[0] - px),
+                    vy * keep + k * (pos[1] - py),
+                    vz * keep + k * (pos[2] - pz),
+                )
+                acc = (
+                    ax * keep + k * (vel[0] - vx),
+                    ay * keep + k * (vel[1] - vy),
+                    az * keep + k * (vel[2] - vz),
+                )
 
-                pos = _vec_lerp(prev.position, current, self.smoothing_alpha)
-                raw_vel = _vec_div(_vec_sub(pos, prev.position), dt)
-                vel = _vec_lerp(prev.velocity, raw_vel, self.smoothing_alpha)
-
-                raw_acc = _vec_div(_vec_sub(vel, prev.velocity), dt)
-                acc = _vec_lerp(prev.acceleration, raw_acc, self.smoothing_alpha)
-
-            speed = _vec_mag(vel)
-            acc_mag = _vec_mag(acc)
-            depth = -pos.z
+            speed = math.hypot(*vel)
+            acc_mag = math.hypot(*acc)
+            depth = -pos[2]
 
             self._history[side] = _History(
                 position=pos,
@@ -100,22 +99,23 @@ class MotionEstimator:
                 timestamp_ms=now,
             )
 
-            hands.append(
-                HandState(
-                    side=side,
-                    confidence=obs.confidence,
-                    landmarks=obs.landmarks,
-                    position=pos,
-                    velocity=vel,
-                    acceleration=acc,
-                    speed=speed,
-                    acceleration_magnitude=acc_mag,
-                    depth=depth,
-                    timestamp_ms=now,
-                )
+            hand = HandState(
+                side=side,
+                confidence=obs.confidence,
+                landmarks=obs.landmarks,
+                position=Vec3(*pos),
+                velocity=Vec3(*vel),
+                acceleration=Vec3(*acc),
+                speed=speed,
+                acceleration_magnitude=acc_mag,
+                depth=depth,
+                timestamp_ms=now,
             )
+            hands.append(hand)
+            if side == "RIGHT" and right is None:
+                right = hand
+            elif side == "LEFT" and left is None:
+                left = hand
 
-        right = next((h for h in hands if h.side == "RIGHT"), None)
-        left = next((h for h in hands if h.side == "LEFT"), None)
         return FrameState(hands=hands, right_hand=right, left_hand=left)
 
@@ -1,4 +1,5 @@
 import cv2
+import numpy as np
 
 
 HAND_CONNECTIONS = [
@@ -25,18 +26,24 @@ HAND_CONNECTIONS = [
     (0, 17),
 ]
 
+# Flat endpoint LUT: one 1-D gather per frame, reshaped to (21, 2, 2) contours.
+_EDGE_IDX = np.array(HAND_CONNECTIONS, dtype=np.int32).ravel()
+
+# Each joint as a zero-length segment; at thickness 8 OpenCV rasterizes it
+# to the same disc as a filled radius-4 circle.
+_JOINT_IDX = np.repeat(np.arange(21, dtype=np.int32), 2)
+
 
 def draw_hand(frame, lm, color=(0, 255, 0)):
+    """Draw a hand from a (21, 3) array of normalized landmarks."""
     h, w, _ = frame.shape
+    pts = (lm[:, :2] * np.array([w, h], dtype=np.float32)).astype(np.int32)
 
-    for a, b in HAND_CONNECTIONS:
-        ax, ay = int(lm[a].x * w), int(lm[a].y * h)
-        bx, by = int(lm[b].x * w), int(lm[b].y * h)
-        cv2.line(frame, (ax, ay), (bx, by), color, 2)
+    segments = pts[_EDGE_IDX].reshape(-1, 2, 2)
+    cv2.polylines(frame, segments, False, color, 2)
 
-    for point in lm:
-        px, py = int(point.x * w), int(point.y * h)
-        cv2.circle(frame, (px, py), 4, (0, 200, 255), -1)
+    joints = pts[_JOINT_IDX].reshape(-1, 2, 2)
+    cv2.polylines(frame, joints, False, (0, 200, 255), 8)
 
 
 def draw_frame_overlay(frame, frame_state, action_text: str, gestures=None):
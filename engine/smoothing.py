@@ -0,0 +1,40 @@
+import math
+
+
+def _smoothing_factor(dt: float, cutoff_hz: float) -> float:
+    tau = 1.0 / (2.0 * math.pi * cutoff_hz)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """
+    1€ filter (Casiez et al.) for one cursor axis.
+
+    An exponential smoother whose cutoff frequency rises with the filtered
+    speed: a resting hand is smoothed hard, a fast sweep passes with little
+    lag. Each output is a blend of the previous output and the new sample,
+    so unlike a velocity-extrapolating filter it never overshoots a stop.
+    """
+
+    def __init__(self, min_cutoff: float = 0.5, beta: float = 0.005, d_cutoff: float = 1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.value = 0.0
+        self.derivative = 0.0
+        self.initialized = False
+
+    def reset(self, value: float) -> None:
+        self.value = value
+        self.derivative = 0.0
+        self.initialized = True
+
+    def filter(self, value: float, dt: float) -> float:
+        raw_derivative = (value - self.value) / dt
+        a_d = _smoothing_factor(dt, self.d_cutoff)
+        self.derivative += a_d * (raw_derivative - self.derivative)
+
+        cutoff = self.min_cutoff + self.beta * abs(self.derivative)
+        a = _smoothing_factor(dt, cutoff)
+        self.value += a * (value - self.value)
+        return self.value
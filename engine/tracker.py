@@ -1,14 +1,27 @@
+import itertools
+import operator
 from pathlib import Path
 from typing import List
+from typing import Optional
 
 import cv2
 import mediapipe as mp
+import numpy as np
 from mediapipe.tasks.python import BaseOptions
 from mediapipe.tasks.python import vision
 
 from engine.model import ensure_hand_model
 from engine.types import HandObservation
 
+# mp.Image copies its pixel data on construction, so one wrapper cannot be
+# reused across frames; only the enum lookup is hoisted out of detect().
+_SRGB = mp.ImageFormat.SRGB
+
+_XYZ = operator.attrgetter("x", "y", "z")
+
+# MediaPipe labels handedness assuming a mirrored input image.
+_MIRRORED_SIDE = {"LEFT": "RIGHT", "RIGHT": "LEFT"}
+
 
 class HandTracker:
     """MediaPipe Tasks hand tracker wrapper."""
@@ -18,24 +31,78 @@ class HandTracker:
         model_path: Path,
         num_hands: int = 2,
         min_detection_confidence: float = 0.6,
-        min_presence_confidence: float = 0.6,
-        min_tracking_confidence: float = 0.6,
+        min_presence_confidence: float = 0.3,
+        min_tracking_confidence: float = 0.5,
+        use_gpu: bool = True,
+        detect_width: int = 320,
+        mirror: bool = True,
     ):
         ensure_hand_model(model_path)
 
-        options = vision.HandLandmarkerOptions(
-            base_options=BaseOptions(model_asset_path=str(model_path)),
-            running_mode=vision.RunningMode.VIDEO,
-            num_hands=num_hands,
-            min_hand_detection_confidence=min_detection_confidence,
-            min_hand_presence_confidence=min_presence_confidence,
-            min_tracking_confidence=min_tracking_confidence,
-        )
-        self._landmarker = vision.HandLandmarker.create_from_options(options)
+        # In VIDEO mode the palm detector re-runs when the hand presence score
+        # drops below min_presence_confidence or the IoU between the previous
+        # and current hand box drops below min_tracking_confidence. Keeping
+        # both low holds the cheap landmark-only path through marginal frames.
+        self._last_timestamp_ms = -1
+        # Frames wider than this are downscaled before inference. Landmarks
+        # come back normalized, so callers still map them onto the full frame.
+        self.detect_width = detect_width
+        self._small_buf: Optional[np.ndarray] = None
+        self._rgb_buf: Optional[np.ndarray] = None
+        # Report landmarks and handedness as seen in a mirrored (selfie)
+        # view without flipping the camera frame itself.
+        self.mirror = mirror
+
+        def create(delegate):
+            options = vision.HandLandmarkerOptions(
+                base_options=BaseOptions(
+                    model_asset_path=str(model_path),
+                    delegate=delegate,
+                ),
+                running_mode=vision.RunningMode.VIDEO,
+                num_hands=num_hands,
+                min_hand_detection_confidence=min_detection_confidence,
+                min_hand_presence_confidence=min_presence_confidence,
+                min_tracking_confidence=min_tracking_confidence,
+            )
+            return vision.HandLandmarker.create_from_options(options)
+
+        self.using_gpu = False
+        if use_gpu:
+            # GPU delegate needs Linux/macOS with a working GL context;
+            # anything else raises and we stay on XNNPACK.
+            try:
+                self._landmarker = create(BaseOptions.Delegate.GPU)
+                self.using_gpu = True
+            except (RuntimeError, NotImplementedError) as exc:
+                print(f"GPU delegate unavailable ({exc}); using CPU.")
+        if not self.using_gpu:
+            self._landmarker = create(BaseOptions.Delegate.CPU)
 
     def detect(self, frame_bgr, timestamp_ms: int) -> List[HandObservation]:
-        rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        # VIDEO mode rejects non-increasing timestamps, which would reset
+        # tracking; nudge duplicates forward instead.
+        if timestamp_ms <= self._last_timestamp_ms:
+            timestamp_ms = self._last_timestamp_ms + 1
+        self._last_timestamp_ms = timestamp_ms
+
+        h, w = frame_bgr.shape[:2]
+        if w > self.detect_width:
+            small_h = max(1, round(h * self.detect_width / w))
+            small_shape = (small_h, self.detect_width, frame_bgr.shape[2])
+            if self._small_buf is None or self._small_buf.shape != small_shape:
+                self._small_buf = np.empty(small_shape, dtype=frame_bgr.dtype)
+            frame_bgr = cv2.resize(
+                frame_bgr,
+                (self.detect_width, small_h),
+                dst=self._small_buf,
+                interpolation=cv2.INTER_AREA,
+            )
+
+        if self._rgb_buf is None or self._rgb_buf.shape != frame_bgr.shape:
+            self._rgb_buf = np.empty_like(frame_bgr)
+        rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+        mp_image = mp.Image(image_format=_SRGB, data=rgb)
         result = self._landmarker.detect_for_video(mp_image, timestamp_ms)
 
         observations: List[HandObservation] = []
@@ -50,10 +117,20 @@ class HandTracker:
                 handedness = result.handedness[i][0].category_name.upper()
                 confidence = float(result.handedness[i][0].score)
 
+            # Convert once here so downstream consumers share one array.
+            landmark_array = np.fromiter(
+                itertools.chain.from_iterable(map(_XYZ, landmarks)),
+                dtype=np.float32,
+                count=len(landmarks) * 3,
+            ).reshape(-1, 3)
+            if self.mirror:
+                landmark_array[:, 0] = 1.0 - landmark_array[:, 0]
+                handedness = _MIRRORED_SIDE.get(handedness, handedness)
+
             observations.append(
                 HandObservation(
                     side=handedness,
-                    landmarks=landmarks,
+                    landmarks=landmark_array,
                     confidence=confidence,
                 )
             )
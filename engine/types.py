@@ -1,30 +1,32 @@
 from dataclasses import dataclass
-from typing import List, Optional, Sequence
+from typing import List, Optional
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class Vec3:
     x: float
     y: float
     z: float
 
 
-@dataclass
+@dataclass(slots=True)
 class HandObservation:
     """Raw tracker output for one hand in current frame."""
 
     side: str  # LEFT or RIGHT
-    landmarks: Sequence
+    landmarks: np.ndarray  # (21, 3) float32 normalized x, y, z
     confidence: float
 
 
-@dataclass
+@dataclass(slots=True)
 class HandState:
     """Smoothed motion state for one hand."""
 
     side: str
     confidence: float
-    landmarks: Sequence
+    landmarks: np.ndarray  # (21, 3) float32 normalized x, y, z
     position: Vec3
     velocity: Vec3
     acceleration: Vec3
@@ -34,7 +36,7 @@ class HandState:
     timestamp_ms: int
 
 
-@dataclass
+@dataclass(slots=True)
 class FrameState:
     """State container for the current frame."""
 
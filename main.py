@@ -4,15 +4,27 @@ Dependencies (install with: pip install -r requirements.txt):
 - mediapipe
 - pyautogui
 - numpy
+
+Optional:
+- numba (JIT-compiles the static gesture classifier)
 """
 
+import os
+
+# Must be set before MediaPipe/TFLite load: silence their startup banners
+# and keep oneDNN's custom kernels (and their rounding changes) off.
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+os.environ.setdefault("TF_ENABLE_ONEDNN_OPTS", "0")
+os.environ.setdefault("GLOG_minloglevel", "2")
+
 from pathlib import Path
+import sys
 import time
 
 import cv2
-import pyautogui
 
 from engine.actions import ActionEngine
+from engine.display import FrameDisplay
 from engine.gestures import GestureRecognizer
 from engine.motion import MotionEstimator
 from engine.overlay import draw_frame_overlay
@@ -34,11 +46,28 @@ def pick_cursor_hand(frame_state):
     return None
 
 
-def main():
-    pyautogui.FAILSAFE = True
-    pyautogui.PAUSE = 0.01
+def open_camera(index: int = 0, width: int = 640, height: int = 480):
+    """
+    Open the webcam for low latency: one queued frame, MJPG transfer.
+    The landmarker resizes internally, so 640x480 loses nothing.
+    """
+    if sys.platform.startswith("linux"):
+        cap = cv2.VideoCapture(index, cv2.CAP_V4L2)
+    else:
+        cap = cv2.VideoCapture(index)
+    if not cap.isOpened():
+        return cap
+
+    if not cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+        print("Warning: camera ignored CAP_PROP_BUFFERSIZE=1; frames may lag.")
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    return cap
 
-    cap = cv2.VideoCapture(0)
+
+def main():
+    cap = open_camera(0)
     if not cap.isOpened():
         print("Error: Could not open webcam.")
         return
@@ -51,43 +80,48 @@ def main():
         click_cooldown=0.45,
         scroll_cooldown=0.20,
         scroll_amount=120,
-        cursor_alpha=0.25,
+        cursor_min_cutoff=0.5,
+        cursor_beta=0.005,
     )
 
+    display = FrameDisplay("AirController")
+    frame_idx = 0
+
     try:
-        while True:
+        while display.poll():
             ok, frame = cap.read()
             if not ok:
                 break
 
-            frame = cv2.flip(frame, 1)
-            timestamp_ms = int(time.time() * 1000)
+            timestamp_ms = time.monotonic_ns() // 1_000_000
 
             observations = tracker.detect(frame, timestamp_ms)
             frame_state = motion.update(observations, timestamp_ms)
 
-            # Draw all tracked hands.
-            for hand in frame_state.hands:
-                color = (255, 120, 0) if hand.side == "LEFT" else (0, 255, 0)
-                draw_hand(frame, hand.landmarks, color=color)
-
             # Cursor hand and gesture handling.
             cursor_hand = pick_cursor_hand(frame_state)
             if cursor_hand:
                 actions.move_cursor_from_hand(cursor_hand)
 
             gestures = recognizer.detect_for_frame(frame_state)
-            action_text = actions.apply(gestures)
-
-            draw_frame_overlay(frame, frame_state, action_text, gestures=gestures)
-            cv2.imshow("AirController", frame)
-
-            if cv2.waitKey(1) & 0xFF == ord("q"):
-                break
+            action_text = actions.apply(gestures, timestamp_ms)
+
+            # The preview only needs every other frame; control runs on all.
+            frame_idx += 1
+            if frame_idx & 1 == 0:
+                # The tracker mirrors landmarks, so only shown frames are
+                # flipped. In place: cap.read() returns a fresh array per frame.
+                cv2.flip(frame, 1, dst=frame)
+                for hand in frame_state.hands:
+                    color = (255, 120, 0) if hand.side == "LEFT" else (0, 255, 0)
+                    draw_hand(frame, hand.landmarks, color=color)
+                draw_frame_overlay(frame, frame_state, action_text, gestures=gestures)
+                display.show(frame)
     finally:
+        display.close()
+        actions.close()
         tracker.close()
         cap.release()
-        cv2.destroyAllWindows()
 
 
 if __name__ == "__main__":